@@ -1,32 +1,50 @@
 # cailianpress_to_feishu_rewritten.py
 
+import io
+import gzip
 import json
 import time
 import random
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import os
 import sys
+import atexit
+import mmap
+import tempfile
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import re
 import hashlib
+from functools import lru_cache
+from operator import attrgetter
 import urllib.parse
-from typing import Optional, List
+from typing import Optional, List, NamedTuple
 
 import requests
-import pytz
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # 可选加速依赖：更快的 JSON 编解码
+except ImportError:
+    orjson = None
 
 # --- 1. 配置常量 ---
 CONFIG = {
     "OUTPUT_DIR": "./output/财联社电报",  # 输出目录已与量化报告目录对齐
     "FEISHU_WEBHOOK_URL": os.getenv("FEISHU_WEBHOOK_URL", ""),  # 飞书自动化 Webhook URL
+    "WEBHOOK_GZIP_THRESHOLD": None,  # Webhook 请求体超过该字节数时启用 gzip 压缩；None/0 表示不压缩（需先确认飞书端支持 Content-Encoding: gzip）
     "MAX_TELEGRAMS_FETCH": 100,  # 每次API请求最大获取电报数量 (根据财联社API实际能力调整)
     "RED_KEYWORDS": ["利好", "利空", "重要", "突发", "紧急", "关注", "提醒", "涨停", "大跌", "突破"],  # 标红关键词，可扩展
     "FILE_SEPARATOR": "━━━━━━━━━━━━━━━━━━━",  # 文件内容分割线
     "USE_PROXY": os.getenv("USE_PROXY", "False").lower() == "true",
     "DEFAULT_PROXY": os.getenv("DEFAULT_PROXY", "http://127.0.0.1:10086"),
     "REQUEST_TIMEOUT": 15, # 请求超时时间
-    "RETRY_ATTEMPTS": 3, # 请求重试次数
-    "RETRY_DELAY": 5, # 重试间隔秒数
+    "RETRY_ATTEMPTS": 3, # 财联社API请求的总尝试次数（由会话适配器按指数退避重试）
+    "API_CACHE_DIR": os.path.join(tempfile.gettempdir(), "cls_cache"), # API响应缓存目录
+    "API_CACHE_TTL": 30, # API响应缓存有效期（秒），高频运行时复用同一份响应
+    "SUMMARY_CACHE_DIR": os.path.join(tempfile.gettempdir(), "cls_summary_cache"), # 5天整合文件的按日渲染缓存目录（不放在 output/ 下，避免被工作流提交）
+    "STATE_FILE_NAME": ".cls_state.json", # 位于 OUTPUT_DIR 下，记录上次处理的 ETag 与最大电报ID，用于跳过未变化的列表
     "KEEP_FILES_COUNT": 7, # 保留的文件数量，超过此数量的旧文件将被自动删除
     
     # 飞书Bot相关配置
@@ -37,12 +55,33 @@ CONFIG = {
     "FEISHU_MAX_FILE_SIZE": 20 * 1024 * 1024,  # 飞书文件上传最大限制 20MB
 }
 
+def _json_loads(raw: bytes):
+    """解析 JSON 字节串，优先使用 orjson"""
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+def _json_dumps(obj) -> bytes:
+    """序列化为 UTF-8 JSON 字节串，优先使用 orjson"""
+    return orjson.dumps(obj) if orjson else json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+# 电报详情页链接前缀
+_DETAIL_URL_PREFIX = "https://www.cls.cn/detail/"
+
+# 标红关键词预编译为单个正则，一次扫描即可判定是否命中任一关键词
+_RED_KEYWORDS_RE = re.compile("|".join(map(re.escape, CONFIG["RED_KEYWORDS"])))
+
+# 北京时间（中国无夏令时，固定 UTC+8），时区对象只构造一次，供时间转换热路径直接引用
+_SHTZ = timezone(timedelta(hours=8))
+_SHTZ_OFFSET = 8 * 3600  # 同一偏移量的秒数，供整数时间运算使用
+
+# 电报排序键：timestamp_raw 在解析时已统一为 int，用 C 实现的 attrgetter 代替 lambda
+_BY_TIMESTAMP = attrgetter("timestamp_raw")
+
 # --- 2. 时间处理工具类 ---
 class TimeHelper:
     """提供时间相关的辅助方法"""
-    BEIJING_TZ = pytz.timezone("Asia/Shanghai")
+    BEIJING_TZ = _SHTZ
     @staticmethod
-    def get_beijing_time() -> datetime: return datetime.now(TimeHelper.BEIJING_TZ)
+    def get_beijing_time() -> datetime: return datetime.now(_SHTZ)
     @staticmethod
     def format_date(dt: datetime = None) -> str: return (dt or TimeHelper.get_beijing_time()).strftime("%Y年%m月%d日")
     @staticmethod
@@ -50,67 +89,191 @@ class TimeHelper:
     @staticmethod
     def format_datetime(dt: datetime = None) -> str: return (dt or TimeHelper.get_beijing_time()).strftime("%Y-%m-%d %H:%M:%S")
     @staticmethod
-    def timestamp_to_beijing_datetime(timestamp: int) -> datetime: return datetime.fromtimestamp(timestamp, TimeHelper.BEIJING_TZ)
+    def timestamp_to_beijing_datetime(timestamp: int) -> datetime: return datetime.fromtimestamp(timestamp, _SHTZ)
     @staticmethod
     def timestamp_to_hhmm(timestamp: int) -> str:
-        try: return TimeHelper.timestamp_to_beijing_datetime(timestamp).strftime("%H:%M")
+        # 北京时间无夏令时，直接用整数运算取时分，避免为每条电报构造带时区的 datetime
+        try:
+            seconds_of_day = (int(timestamp) + _SHTZ_OFFSET) % 86400
+            return f"{seconds_of_day // 3600:02d}:{seconds_of_day // 60 % 60:02d}"
         except (ValueError, TypeError): return ""
+    @staticmethod
+    def timestamp_to_date_str(timestamp: int) -> str:
+        return TimeHelper._day_number_to_date_str((int(timestamp) + _SHTZ_OFFSET) // 86400)
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _day_number_to_date_str(day_number: int) -> str:
+        # 同一批电报通常只跨一两天，按“北京时间日序号”缓存日期字符串
+        return datetime.fromtimestamp(day_number * 86400, timezone.utc).strftime("%Y-%m-%d")
 
 # --- 3. 财联社 API 交互类 ---
+class Telegram(NamedTuple):
+    """解析后的单条电报；字段按位置存储，比字典更省内存，属性访问无需哈希查找"""
+    id: str
+    content: str
+    time: str
+    url: str
+    is_red: bool
+    timestamp_raw: int
+    date_str: str  # 北京时间日期 YYYY-MM-DD，解析时算好，按日分组时直接使用
+
 class CailianpressAPI:
     """处理财联社电报数据的获取和解析"""
     BASE_URL = "https://www.cls.cn/nodeapi/updateTelegraphList"
     APP_PARAMS = {"app_name": "CailianpressWeb", "os": "web", "sv": "7.7.5"}
     HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"}
+    # 静态参数按键排序后的签名原文（已编码为字节），类加载时拼接一次
+    STATIC_SIGN_BASE = "&".join(f"{key}={value}" for key, value in sorted(APP_PARAMS.items())).encode('utf-8')
     @staticmethod
-    def _generate_signature(params: dict) -> str:
-        sorted_keys = sorted(params.keys())
-        params_string = "&".join([f"{key}={params[key]}" for key in sorted_keys])
-        sha1_hash = hashlib.sha1(params_string.encode('utf-8')).hexdigest()
-        return hashlib.md5(sha1_hash.encode('utf-8')).hexdigest()
+    def _sign(params_bytes: bytes) -> str:
+        # 十六进制摘要仅含 ASCII 字符，直接按 ASCII 编码后再做 MD5
+        # 签名仅用于接口校验而非安全用途，标记 usedforsecurity=False 以免在 FIPS 模式主机上报错
+        sha1_hex = hashlib.sha1(params_bytes, usedforsecurity=False).hexdigest().encode('ascii')
+        return hashlib.md5(sha1_hex, usedforsecurity=False).hexdigest()
     @staticmethod
     def _get_request_params() -> dict:
-        all_params = {**CailianpressAPI.APP_PARAMS}
-        all_params["sign"] = CailianpressAPI._generate_signature(all_params)
-        return all_params
+        # 请求参数全部是静态的，直接对预先排好序的签名原文签名
+        return {**CailianpressAPI.APP_PARAMS, "sign": CailianpressAPI._sign(CailianpressAPI.STATIC_SIGN_BASE)}
+    @staticmethod
+    def _get_cache_path(url: str) -> Path:
+        cache_key = hashlib.blake2b(url.encode('utf-8'), digest_size=8).hexdigest()
+        return Path(CONFIG["API_CACHE_DIR"]) / f"{cache_key}.json"
+    @staticmethod
+    def _load_cached_response(url: str) -> Optional[bytes]:
+        """在TTL内返回缓存的原始响应，过期或不存在时返回 None"""
+        cache_path = CailianpressAPI._get_cache_path(url)
+        try:
+            if cache_path.stat().st_mtime > time.time() - CONFIG["API_CACHE_TTL"]:
+                return cache_path.read_bytes()
+        except OSError: pass
+        return None
+    @staticmethod
+    def _store_cached_response(url: str, raw: bytes) -> None:
+        """先写临时文件再原子替换，避免并发运行读到半截缓存"""
+        cache_path = CailianpressAPI._get_cache_path(url)
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=cache_path.parent, delete=False) as tmp:
+                tmp.write(raw)
+            os.replace(tmp.name, cache_path)
+        except OSError as e: print(f"[{TimeHelper.format_datetime()}] 写入API响应缓存失败: {e}")
+    @staticmethod
+    def _get_state_path() -> Path:
+        return Path(CONFIG["OUTPUT_DIR"]) / CONFIG["STATE_FILE_NAME"]
     @staticmethod
-    def fetch_telegrams() -> list[dict]:
-        params = CailianpressAPI._get_request_params()
-        full_url = f"{CailianpressAPI.BASE_URL}?{urllib.parse.urlencode(params)}"
-        proxies = {"http": CONFIG["DEFAULT_PROXY"], "https": CONFIG["DEFAULT_PROXY"]} if CONFIG["USE_PROXY"] else None
+    def _load_state() -> dict:
+        try:
+            with open(CailianpressAPI._get_state_path(), "rb") as f: return _json_loads(f.read())
+        except (OSError, ValueError): return {}
+    @staticmethod
+    def save_fetch_state(state: Optional[dict]) -> None:
+        """在本次电报处理完成后再落盘 fetch_telegrams 返回的抓取状态，避免中途失败导致下次运行误判为“无变化”"""
+        if not state: return
+        state_path = CailianpressAPI._get_state_path()
+        try:
+            state_path.parent.mkdir(parents=True, exist_ok=True)
+            state_path.write_bytes(_json_dumps(state))
+        except OSError as e: print(f"[{TimeHelper.format_datetime()}] 保存抓取状态失败: {e}")
+    @staticmethod
+    def _request_roll_data(url: str, etag: Optional[str] = None) -> Optional[tuple]:
+        """请求财联社API，成功时返回 (响应, 解析后的数据) 并写入缓存；服务端返回 304 时数据为 None"""
         print(f"[{TimeHelper.format_datetime()}] 正在请求财联社API...")
-        for attempt in range(CONFIG["RETRY_ATTEMPTS"]):
+        # 浏览器 User-Agent 仅用于财联社API，与代理一样按请求传入，不设置到会话上影响飞书请求
+        headers = {**CailianpressAPI.HEADERS, "If-None-Match": etag} if etag else CailianpressAPI.HEADERS
+        # 连接错误、超时与服务端错误的重试统一由会话适配器完成（共 RETRY_ATTEMPTS 次尝试），这里不再叠加一层循环
+        try:
+            response = _SESSION.get(url, headers=headers, proxies=_CLS_PROXIES, timeout=CONFIG["REQUEST_TIMEOUT"])
+            if response.status_code == 304: return response, None
+            response.raise_for_status()
+            data = _json_loads(response.content)
+            if data.get("error") == 0 and data.get("data") and data["data"].get("roll_data"):
+                CailianpressAPI._store_cached_response(url, response.content)
+                return response, data
+            print(f"[{TimeHelper.format_datetime()}] API返回数据异常: error={data.get('error')}")
+        except requests.exceptions.RequestException as e: print(f"[{TimeHelper.format_datetime()}] 请求API失败: {e}")
+        except ValueError as e: print(f"[{TimeHelper.format_datetime()}] JSON解析失败: {e}")
+        return None
+    @staticmethod
+    def fetch_telegrams() -> tuple[Optional[list[Telegram]], Optional[dict]]:
+        """获取并解析电报列表，返回 (电报列表, 新的抓取状态)。
+        请求失败时电报列表为 None；列表相对上次运行没有变化时返回空列表且状态为 None（无需更新）。
+        """
+        full_url = _CLS_SIGNED_URL
+        state = CailianpressAPI._load_state()
+        etag = state.get("etag")
+        data, cached = None, CailianpressAPI._load_cached_response(full_url)
+        if cached is not None:
             try:
-                response = requests.get(full_url, proxies=proxies, headers=CailianpressAPI.HEADERS, timeout=CONFIG["REQUEST_TIMEOUT"])
-                response.raise_for_status()
-                data = response.json()
-                if data.get("error") == 0 and data.get("data") and data["data"].get("roll_data"):
-                    raw_telegrams = data["data"]["roll_data"]
-                    print(f"[{TimeHelper.format_datetime()}] 成功获取 {len(raw_telegrams)} 条原始财联社电报。")
-                    processed = []
-                    for item in raw_telegrams:
-                        if item.get("is_ad"): continue
-                        item_id = str(item.get("id"))
-                        title = item.get("title", "")
-                        content = item.get("brief", "") or title
-                        timestamp = item.get("ctime")
-                        item_time_str, ts_int = "", None
-                        if timestamp:
-                            try:
-                                ts_int = int(timestamp)
-                                item_time_str = TimeHelper.timestamp_to_hhmm(ts_int)
-                            except (ValueError, TypeError): pass
-                        processed.append({
-                            "id": item_id, "content": content, "time": item_time_str,
-                            "url": f"https://www.cls.cn/detail/{item_id}" if item_id else "",
-                            "is_red": any(k in (title + content) for k in CONFIG["RED_KEYWORDS"]),
-                            "timestamp_raw": ts_int
-                        })
-                    return processed
-            except requests.exceptions.RequestException as e: print(f"[{TimeHelper.format_datetime()}] 请求API失败 (尝试 {attempt + 1}): {e}")
-            except json.JSONDecodeError as e: print(f"[{TimeHelper.format_datetime()}] JSON解析失败 (尝试 {attempt + 1}): {e}")
-            if attempt < CONFIG["RETRY_ATTEMPTS"] - 1: time.sleep(CONFIG["RETRY_DELAY"])
-        return []
+                data = _json_loads(cached)
+                print(f"[{TimeHelper.format_datetime()}] 命中API响应缓存（{CONFIG['API_CACHE_TTL']}秒内），跳过网络请求。")
+            except ValueError: data = None
+        if data is None:
+            result = CailianpressAPI._request_roll_data(full_url, etag)
+            if result is None: return None, None
+            response, data = result
+            if data is None:
+                print(f"[{TimeHelper.format_datetime()}] 电报列表未更新（HTTP 304），跳过解析。")
+                return [], None
+            etag = response.headers.get("ETag") or None
+        raw_telegrams = data["data"]["roll_data"]
+        print(f"[{TimeHelper.format_datetime()}] 成功获取 {len(raw_telegrams)} 条原始财联社电报。")
+        # 服务端不支持条件请求时的兜底：最新电报ID与上次处理时相同，说明列表没有新内容
+        max_id = max((int(i["id"]) for i in raw_telegrams if str(i.get("id", "")).isdigit()), default=0)
+        if max_id and max_id == state.get("max_id"):
+            print(f"[{TimeHelper.format_datetime()}] 最新电报ID与上次相同，跳过解析。")
+            return [], None
+        new_state = {"etag": etag, "max_id": max_id}
+        processed = []
+        for item in raw_telegrams:
+            g = item.get  # 绑定到局部变量，减少循环内的方法查找
+            if g("is_ad"): continue
+            raw_id = g("id")
+            item_id = str(raw_id) if raw_id is not None else ""  # 解析时统一转为字符串，缺失时为空串而非 "None"
+            title = g("title", "")
+            content = g("brief", "") or title
+            timestamp = g("ctime")
+            item_time_str, ts_int, item_date_str = "", 0, ""  # 时间戳统一为 int，缺失时记为 0，便于直接排序
+            if timestamp:
+                try:
+                    ts_int = int(timestamp)
+                    item_time_str = TimeHelper.timestamp_to_hhmm(ts_int)
+                    item_date_str = TimeHelper.timestamp_to_date_str(ts_int)
+                except (ValueError, TypeError): pass
+            processed.append(Telegram(
+                item_id, content, item_time_str,
+                _DETAIL_URL_PREFIX + item_id if item_id else "",
+                # 无摘要时正文即标题，无需对同一字符串再扫描一次
+                bool(_RED_KEYWORDS_RE.search(title) or (content is not title and _RED_KEYWORDS_RE.search(content))),
+                ts_int, item_date_str
+            ))
+        return processed, new_state
+
+# 全局复用的 HTTP 会话：保持长连接，避免每次请求重新进行 TCP/TLS 握手
+_SESSION = requests.Session()
+_SESSION_ADAPTER = HTTPAdapter(
+    pool_connections=4, pool_maxsize=8,  # 飞书通知在后台线程与主流程并发发出，单主机连接池留出余量
+    # 连接错误、超时与限流/服务端错误在传输层按指数退避重试；POST 非幂等，保持 urllib3 默认不重试
+    max_retries=Retry(total=CONFIG["RETRY_ATTEMPTS"] - 1, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+)
+_SESSION.mount("http://", _SESSION_ADAPTER)
+_SESSION.mount("https://", _SESSION_ADAPTER)
+atexit.register(_SESSION.close)
+
+# APP_PARAMS 为静态参数，签名恒定，模块加载时计算一次即可
+_CLS_SIGNED_URL = f"{CailianpressAPI.BASE_URL}?{urllib.parse.urlencode(CailianpressAPI._get_request_params())}"
+# 代理仅作用于财联社API（飞书请求不走代理），因此按请求传入而不设置到会话上
+_CLS_PROXIES = {"http": CONFIG["DEFAULT_PROXY"], "https": CONFIG["DEFAULT_PROXY"]} if CONFIG["USE_PROXY"] else None
+
+# 从 Markdown 原始字节中提取详情链接ID的预编译正则
+_DETAIL_ID_RE = re.compile(rb'\(https://www\.cls\.cn/detail/(\d+)\)')
+
+# 电报行格式化函数表：is_red -> (带链接, 无链接)
+_TELEGRAM_LINE_FORMATTERS = {
+    True: (lambda time_str, title, url: f"  - [{time_str}] **[{title}]({url})**",
+           lambda time_str, title: f"  - [{time_str}] **{title}**"),
+    False: (lambda time_str, title, url: f"  - [{time_str}] [{title}]({url})",
+            lambda time_str, title: f"  - [{time_str}] {title}"),
+}
 
 # --- 4. 文件写入与读取类 (已重构为仅追加模式) ---
 class TelegramFileManager:
@@ -121,105 +284,168 @@ class TelegramFileManager:
     def _get_file_path(self, date_str: str) -> Path:
         return self.output_dir / f"财联社电报_{date_str}.md"
 
+    def _get_ids_path(self, date_str: str) -> Path:
+        """与当日 Markdown 文件同名的 ID 索引文件，每行一个电报ID"""
+        return self._get_file_path(date_str).with_suffix(".ids")
+
+    @staticmethod
+    def _append_bytes(path: Path, data: bytes) -> None:
+        """以 O_APPEND 打开并追加整段数据；os.write 可能只写入一部分，循环直到全部写完"""
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                if written <= 0: raise OSError(f"写入 {path} 时未能写入任何数据")
+                view = view[written:]
+        finally:
+            os.close(fd)
+
     def get_existing_ids_for_date(self, date_str: str) -> set:
-        """仅用于获取文件中已存在的ID集合，用于去重。"""
-        file_path = self._get_file_path(date_str)
-        if not file_path.exists():
+        """
+        获取当日已保存的电报ID集合，用于去重。
+        
+        优先读取 .ids 索引文件；索引不存在时（旧数据）回退为扫描 Markdown 文件。
+        """
+        # 直接尝试打开，不存在时由异常分支处理，省去单独的 exists() 检查
+        try:
+            # 逐行流式读取，峰值内存与单行长度相关而非整个文件
+            with open(self._get_ids_path(date_str), "r", encoding="utf-8") as f:
+                return {tid for line in f if (tid := line.strip())}
+        except FileNotFoundError:
+            return self._scan_ids_from_markdown(date_str)
+
+    def _scan_ids_from_markdown(self, date_str: str) -> set:
+        """从当日 Markdown 文件的详情链接中提取电报ID"""
+        try:
+            f = self._get_file_path(date_str).open('rb')
+        except FileNotFoundError:
             return set()
+        with f:
+            # 空文件无法 mmap；大小取自已打开的文件描述符，无需再次 stat 路径
+            if os.fstat(f.fileno()).st_size == 0:
+                return set()
+            # 通过 mmap 直接在原始字节上匹配，免去整文件的 UTF-8 解码
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return {m.decode('ascii') for m in _DETAIL_ID_RE.findall(mm)}
+
+    def _format_telegram_lines_for_insertion(self, telegrams: List[Telegram], is_red: bool) -> List[str]:
+        """将同一类别的电报批量格式化为要插入文件的文本行列表，类别分支在循环外确定。"""
+        fmt_with_url, fmt_plain = _TELEGRAM_LINE_FORMATTERS[is_red]
+        lines = []
+        for t in telegrams:
+            url = t.url
+            lines.append(fmt_with_url(t.time, t.content, url) if url else fmt_plain(t.time, t.content))
+            lines.append("") # 每条内容后紧随一个空行
+        return lines
+
+    def _insert_lines(self, content: str, new_red_lines: List[str], new_normal_lines: List[str]) -> List[str]:
+        """将新电报行插入到对应章节标题之后，返回更新后的全部行。"""
+        # 空文件（含新建）使用模板
+        if content:
+            lines = content.split('\n')
+        else:
+            lines = ["**🔴 重要电报**", "", CONFIG["FILE_SEPARATOR"], "", "**📰 一般电报**", ""]
+        
+        # 插入“一般电报”
+        if new_normal_lines:
+            try:
+                idx = lines.index("**📰 一般电报**") + 1
+                # 在标题行和第一条内容间插入一个空行（如果需要）
+                if idx < len(lines) and lines[idx].strip() != "": lines.insert(idx, "")
+                lines[idx+1:idx+1] = new_normal_lines
+            except ValueError: # 如果标题不存在，则在末尾追加
+                lines.extend(["", CONFIG["FILE_SEPARATOR"], "", "**📰 一般电报**", ""])
+                lines.extend(new_normal_lines)
+
+        # 插入“重要电报”
+        if new_red_lines:
+            try:
+                idx = lines.index("**🔴 重要电报**") + 1
+                if idx < len(lines) and lines[idx].strip() != "": lines.insert(idx, "")
+                lines[idx+1:idx+1] = new_red_lines
+            except ValueError: # 如果标题不存在，则在开头追加
+                lines.insert(0, "**🔴 重要电报**")
+                lines.insert(1, "")
+                lines[2:2] = new_red_lines
         
-        ids = set()
-        content = file_path.read_text(encoding="utf-8")
-        # 正则表达式从URL中提取ID
-        found_ids = re.findall(r'\(https://www.cls.cn/detail/(\d+)\)', content)
-        ids.update(found_ids)
-        return ids
-
-    def _format_telegram_lines_for_insertion(self, telegram: dict) -> List[str]:
-        """将单条电报格式化为要插入文件的文本行列表。"""
-        title = telegram.get("content", "")
-        time_str = telegram.get("time", "")
-        url = telegram.get("url", "")
-        is_red = telegram.get("is_red", False)
-        
-        line = ""
-        if url:
-            if is_red: line = f"  - [{time_str}] **[{title}]({url})**"
-            else: line = f"  - [{time_str}] [{title}]({url})"
-        else: # Fallback
-            if is_red: line = f"  - [{time_str}] **{title}**"
-            else: line = f"  - [{time_str}] {title}"
-        
-        return [line, ""] # 返回内容行和紧随其后的一个空行
-
-    def append_new_telegrams(self, new_telegrams: List[dict]) -> bool:
+        return lines
+
+    def append_new_telegrams(self, new_telegrams: List[Telegram]) -> tuple:
         """
         核心方法：将新电报追加到对应的日期文件中，不改动旧内容。
+        
+        返回 (是否写入了新内容, 是否所有日期文件都写入成功)，以便区分“没有新内容”与“写入失败”。
         """
         if not new_telegrams:
             print(f"[{TimeHelper.format_datetime()}] 没有新电报需要保存到文件。")
-            return False
+            return False, True
 
         # 按时间倒序排列新电报，确保最新的在最前面
-        new_telegrams.sort(key=lambda x: x.get("timestamp_raw", 0), reverse=True)
+        new_telegrams.sort(key=_BY_TIMESTAMP, reverse=True)
         
         # 按日期对新电报进行分组
         telegrams_by_date = {}
         for t in new_telegrams:
-            if not t.get("timestamp_raw"): continue
-            dt = TimeHelper.timestamp_to_beijing_datetime(t["timestamp_raw"])
-            date_str = dt.strftime("%Y-%m-%d")
+            date_str = t.date_str
+            if not date_str: continue
             if date_str not in telegrams_by_date: telegrams_by_date[date_str] = []
             telegrams_by_date[date_str].append(t)
 
-        saved_any_new = False
-        for date_str, items_for_day in telegrams_by_date.items():
-            file_path = self._get_file_path(date_str)
-            
-            new_red = [t for t in items_for_day if t.get("is_red")]
-            new_normal = [t for t in items_for_day if not t.get("is_red")]
+        # 各日期文件互不相关；跨天时用线程池并发读写（文件 I/O 会释放 GIL），单日时直接写入
+        if not telegrams_by_date: return False, True
+        if len(telegrams_by_date) == 1:
+            saved = self._save_one_day(*next(iter(telegrams_by_date.items())))
+            return saved, saved
+        with ThreadPoolExecutor(max_workers=min(4, len(telegrams_by_date))) as executor:
+            results = list(executor.map(self._save_one_day, telegrams_by_date.keys(), telegrams_by_date.values()))
+        return any(results), all(results)
 
-            # 将新电报格式化为待插入的行
-            new_red_lines = [line for t in new_red for line in self._format_telegram_lines_for_insertion(t)]
-            new_normal_lines = [line for t in new_normal for line in self._format_telegram_lines_for_insertion(t)]
+    def _save_one_day(self, date_str: str, items_for_day: List[Telegram]) -> bool:
+        """将某一天的新电报插入对应的日期文件并追加ID索引，成功返回 True"""
+        file_path = self._get_file_path(date_str)
 
-            # 读取现有文件或创建模板
-            if file_path.exists():
-                lines = file_path.read_text(encoding="utf-8").split('\n')
-            else:
-                lines = ["**🔴 重要电报**", "", CONFIG["FILE_SEPARATOR"], "", "**📰 一般电报**", ""]
-            
-            # 插入“一般电报”
-            if new_normal_lines:
-                try:
-                    idx = lines.index("**📰 一般电报**") + 1
-                    # 在标题行和第一条内容间插入一个空行（如果需要）
-                    if idx < len(lines) and lines[idx].strip() != "": lines.insert(idx, "")
-                    lines[idx+1:idx+1] = new_normal_lines
-                    saved_any_new = True
-                except ValueError: # 如果标题不存在，则在末尾追加
-                    lines.extend(["", CONFIG["FILE_SEPARATOR"], "", "**📰 一般电报**", ""])
-                    lines.extend(new_normal_lines)
-
-            # 插入“重要电报”
-            if new_red_lines:
-                try:
-                    idx = lines.index("**🔴 重要电报**") + 1
-                    if idx < len(lines) and lines[idx].strip() != "": lines.insert(idx, "")
-                    lines[idx+1:idx+1] = new_red_lines
-                    saved_any_new = True
-                except ValueError: # 如果标题不存在，则在开头追加
-                    lines.insert(0, "**🔴 重要电报**")
-                    lines.insert(1, "")
-                    lines[2:2] = new_red_lines
-
-            # 将更新后的内容写回文件
+        # 单次遍历完成重要/一般电报的分组
+        new_red, new_normal = [], []
+        red_append, normal_append = new_red.append, new_normal.append
+        for t in items_for_day:
+            (red_append if t.is_red else normal_append)(t)
+
+        # 将新电报格式化为待插入的行
+        new_red_lines = self._format_telegram_lines_for_insertion(new_red, True)
+        new_normal_lines = self._format_telegram_lines_for_insertion(new_normal, False)
+
+        # 首次建立索引时，先从旧的 Markdown 中补齐已有ID
+        ids_path = self._get_ids_path(date_str)
+        ids_to_record = [] if ids_path.exists() else sorted(self._scan_ids_from_markdown(date_str))
+        ids_to_record.extend(t.id for t in items_for_day if t.id)
+
+        # 先完整写入同目录下的临时文件，再原子替换，中途失败不会留下写了一半的日文件
+        tmp_path = file_path.with_name(f".{file_path.name}.tmp")
+        try:
             try:
-                file_path.write_text("\n".join(lines), encoding="utf-8")
-                print(f"[{TimeHelper.format_datetime()}] 已将 {len(items_for_day)} 条新电报追加到文件: {file_path}")
-            except Exception as e:
-                print(f"[{TimeHelper.format_datetime()}] 写入文件失败: {e}")
+                with open(file_path, "r", encoding="utf-8") as f: existing_content = f.read()
+            except FileNotFoundError: existing_content = ""
+            lines = self._insert_lines(existing_content, new_red_lines, new_normal_lines)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines))
+            os.replace(tmp_path, file_path)
+        except Exception as e:
+            print(f"[{TimeHelper.format_datetime()}] 写入文件失败: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return False
+        print(f"[{TimeHelper.format_datetime()}] 已将 {len(items_for_day)} 条新电报追加到文件: {file_path}")
 
-        return saved_any_new
+        # Markdown 写入成功后再追加索引，保证索引中的ID都已落盘
+        if ids_to_record:
+            try:
+                self._append_bytes(ids_path, ("\n".join(ids_to_record) + "\n").encode("utf-8"))
+            except OSError as e:
+                # 索引缺少本次的ID会导致下次重复追加，删除索引使去重回退为扫描 Markdown（下次写入时自动重建）
+                print(f"[{TimeHelper.format_datetime()}] 追加ID索引失败，将改为扫描 Markdown 去重: {e}")
+                try: ids_path.unlink(missing_ok=True)
+                except OSError as e2: print(f"[{TimeHelper.format_datetime()}] 删除ID索引失败: {e2}")
+        return True
 
     def cleanup_old_files(self, keep_count: int = 7) -> None:
         """
@@ -250,6 +476,7 @@ class TelegramFileManager:
                 for file_path in files_to_delete:
                     try:
                         file_path.unlink()  # 删除文件
+                        file_path.with_suffix(".ids").unlink(missing_ok=True)  # 同步删除ID索引
                         print(f"[{TimeHelper.format_datetime()}] 已删除旧文件: {file_path.name}")
                     except Exception as e:
                         print(f"[{TimeHelper.format_datetime()}] 删除文件失败 {file_path.name}: {e}")
@@ -266,83 +493,64 @@ class FiveDaysSummaryManager:
         self.base_output_dir = Path(output_dir)
         self.summary_dir = self.base_output_dir / "5days"
         self.summary_dir.mkdir(parents=True, exist_ok=True)
+        # 按日缓存已渲染的章节，以源文件 mtime 作为失效依据；缓存属于本机临时数据，放在系统临时目录
+        self.cache_dir = Path(CONFIG["SUMMARY_CACHE_DIR"])
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
     
     def generate_five_days_summary(self) -> None:
         """生成最近5天的整合文件"""
-        print(f"[{TimeHelper.format_datetime()}] 开始生成最近5天的整合文件...")
-        
         current_time = TimeHelper.get_beijing_time()
-        summary_lines = []
-        summary_lines.append(f"# 财联社电报 - 最近5天整合")
-        summary_lines.append(f"")
-        summary_lines.append(f"**生成时间**: {TimeHelper.format_datetime()}")
-        summary_lines.append(f"**数据范围**: {(current_time - timedelta(days=4)).strftime('%Y-%m-%d')} 至 {current_time.strftime('%Y-%m-%d')}")
-        summary_lines.append(f"")
-        summary_lines.append(CONFIG["FILE_SEPARATOR"])
-        summary_lines.append(f"")
+        now_str = TimeHelper.format_datetime(current_time)
+        print(f"[{now_str}] 开始生成最近5天的整合文件...")
+        
+        # 使用 StringIO 缓冲所有写入，最后一次性落盘
+        buf = io.StringIO()
+        w = buf.write
+        separator = CONFIG["FILE_SEPARATOR"]
+        w("# 财联社电报 - 最近5天整合\n\n")
+        w(f"**生成时间**: {now_str}\n")
+        w(f"**数据范围**: {(current_time - timedelta(days=4)).strftime('%Y-%m-%d')} 至 {current_time.strftime('%Y-%m-%d')}\n\n")
+        w(f"{separator}\n\n")
         
         total_telegrams = 0
+        window_dates = set()
         
         # 遍历最近5天
         for day_offset in range(5):
             target_date = current_time - timedelta(days=day_offset)
-            date_str = target_date.strftime("%Y-%m-%d")
+            # 一次 strftime 得到三种日期格式
+            date_str, date_cn, weekday = target_date.strftime("%Y-%m-%d %Y年%m月%d日 %A").split()
+            window_dates.add(date_str)
             file_path = self.base_output_dir / f"财联社电报_{date_str}.md"
             
-            summary_lines.append(f"## {target_date.strftime('%Y年%m月%d日')} ({target_date.strftime('%A')})")
-            summary_lines.append(f"")
+            w(f"## {date_cn} ({weekday})\n\n")
             
             if file_path.exists():
                 try:
-                    content = file_path.read_text(encoding="utf-8")
-                    
-                    # 提取重要电报部分
-                    red_section = self._extract_section(content, "**🔴 重要电报**")
-                    if red_section:
-                        summary_lines.append("### 🔴 重要电报")
-                        summary_lines.append("")
-                        summary_lines.extend(red_section)
-                        summary_lines.append("")
-                        total_telegrams += len([line for line in red_section if line.strip().startswith("- ")])
-                    
-                    # 提取一般电报部分
-                    normal_section = self._extract_section(content, "**📰 一般电报**")
-                    if normal_section:
-                        summary_lines.append("### 📰 一般电报")
-                        summary_lines.append("")
-                        summary_lines.extend(normal_section)
-                        summary_lines.append("")
-                        total_telegrams += len([line for line in normal_section if line.strip().startswith("- ")])
-                    
-                    if not red_section and not normal_section:
-                        summary_lines.append("*该日期暂无电报数据*")
-                        summary_lines.append("")
-                        
+                    day_lines = self._get_day_section(file_path, date_str)
+                    w("\n".join(day_lines))
+                    w("\n")
+                    total_telegrams += len([line for line in day_lines if line.strip().startswith("- ")])
                 except Exception as e:
                     print(f"[{TimeHelper.format_datetime()}] 读取文件 {file_path} 失败: {e}")
-                    summary_lines.append("*读取该日期数据时出错*")
-                    summary_lines.append("")
+                    w("*读取该日期数据时出错*\n\n")
             else:
-                summary_lines.append("*该日期文件不存在*")
-                summary_lines.append("")
+                w("*该日期文件不存在*\n\n")
             
-            summary_lines.append(CONFIG["FILE_SEPARATOR"])
-            summary_lines.append("")
+            w(f"{separator}\n\n")
         
         # 添加统计信息
-        summary_lines.append(f"## 📊 统计信息")
-        summary_lines.append(f"")
-        summary_lines.append(f"- **总电报数量**: {total_telegrams} 条")
-        summary_lines.append(f"- **数据来源**: 财联社")
-        summary_lines.append(f"- **整合范围**: 最近5天")
-        summary_lines.append(f"")
+        w("## 📊 统计信息\n\n")
+        w(f"- **总电报数量**: {total_telegrams} 条\n")
+        w("- **数据来源**: 财联社\n")
+        w("- **整合范围**: 最近5天\n")
         
         # 保存整合文件
         summary_filename = f"财联社电报_最近5天_{current_time.strftime('%Y%m%d_%H%M%S')}.md"
         summary_file_path = self.summary_dir / summary_filename
         
         try:
-            summary_file_path.write_text("\n".join(summary_lines), encoding="utf-8")
+            summary_file_path.write_text(buf.getvalue(), encoding="utf-8")
             print(f"[{TimeHelper.format_datetime()}] 5天整合文件已生成: {summary_file_path}")
             print(f"[{TimeHelper.format_datetime()}] 整合了 {total_telegrams} 条电报数据")
             
@@ -351,31 +559,107 @@ class FiveDaysSummaryManager:
             
         except Exception as e:
             print(f"[{TimeHelper.format_datetime()}] 生成整合文件失败: {e}")
+        
+        self._cleanup_stale_cache(window_dates)
+    
+    def _get_day_section(self, file_path: Path, date_str: str) -> List[str]:
+        """
+        获取某一天渲染后的章节内容，源文件未变化时直接复用缓存。
+        
+        缓存文件首行记录源文件的 st_mtime_ns，其余为渲染结果。
+        """
+        mtime_tag = str(file_path.stat().st_mtime_ns)
+        cache_path = self.cache_dir / f"{date_str}.part.md"
+        try:
+            cached = cache_path.read_text(encoding="utf-8").split('\n')
+            if cached[0] == mtime_tag:
+                return cached[1:]
+        except (OSError, UnicodeDecodeError):
+            pass  # 缓存不存在或已损坏，按未命中处理，从源文件重新渲染
+        
+        day_lines = self._render_day_section(file_path.read_text(encoding="utf-8"))
+        # 先写临时文件再原子替换，避免写入中断后留下带有效标记的残缺缓存
+        tmp_path = cache_path.with_name(f".{cache_path.name}.tmp")
+        try:
+            tmp_path.write_text("\n".join([mtime_tag] + day_lines), encoding="utf-8")
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            print(f"[{TimeHelper.format_datetime()}] 写入缓存 {cache_path.name} 失败: {e}")
+            tmp_path.unlink(missing_ok=True)
+        return day_lines
+    
+    def _render_day_section(self, content: str) -> List[str]:
+        """将单日电报文件内容渲染为整合文件中的章节行"""
+        day_lines = []
+        
+        # 单次遍历同时提取重要电报与一般电报两个部分
+        sections = self._extract_sections(content, ("**🔴 重要电报**", "**📰 一般电报**"))
+        
+        # 重要电报部分
+        red_section = sections["**🔴 重要电报**"]
+        if red_section:
+            day_lines.append("### 🔴 重要电报")
+            day_lines.append("")
+            day_lines.extend(red_section)
+            day_lines.append("")
+        
+        # 一般电报部分
+        normal_section = sections["**📰 一般电报**"]
+        if normal_section:
+            day_lines.append("### 📰 一般电报")
+            day_lines.append("")
+            day_lines.extend(normal_section)
+            day_lines.append("")
+        
+        if not red_section and not normal_section:
+            day_lines.append("*该日期暂无电报数据*")
+            day_lines.append("")
+        
+        return day_lines
+    
+    def _cleanup_stale_cache(self, window_dates: set) -> None:
+        """删除已滑出5天窗口的日期缓存"""
+        for cache_path in self.cache_dir.glob("*.part.md"):
+            if cache_path.name[:10] not in window_dates:
+                try:
+                    cache_path.unlink()
+                except Exception as e:
+                    print(f"[{TimeHelper.format_datetime()}] 删除缓存文件失败 {cache_path.name}: {e}")
     
-    def _extract_section(self, content: str, section_title: str) -> List[str]:
-        """从文件内容中提取指定章节的内容"""
-        lines = content.split('\n')
-        section_lines = []
-        in_section = False
-        
-        for line in lines:
-            if line.strip() == section_title:
-                in_section = True
+    def _extract_sections(self, content: str, section_titles: tuple) -> dict:
+        """
+        单次遍历文件内容，同时提取多个章节的内容，返回 {章节标题: 行列表}。
+        
+        每个章节从其标题行开始，遇到下一个电报章节标题或分隔符时结束。
+        """
+        sections = {title: [] for title in section_titles}
+        finished = set()
+        current = None
+        separator = CONFIG["FILE_SEPARATOR"]
+        
+        for line in content.split('\n'):
+            stripped = line.strip()
+            if stripped in sections and stripped not in finished:
+                # 进入新章节；此前所在的章节被该标题行截断
+                if current is not None and current != stripped: finished.add(current)
+                current = stripped
                 continue
-            elif in_section and line.strip().startswith("**") and "电报" in line:
-                # 遇到下一个章节标题，停止提取
-                break
-            elif in_section and line.strip() == CONFIG["FILE_SEPARATOR"]:
-                # 遇到分隔符，停止提取
-                break
-            elif in_section:
-                section_lines.append(line)
-        
-        # 移除末尾的空行
-        while section_lines and not section_lines[-1].strip():
-            section_lines.pop()
-        
-        return section_lines
+            if current is None:
+                continue
+            if (stripped.startswith("**") and "电报" in line) or stripped == separator:
+                # 遇到下一个章节标题或分隔符，当前章节提取结束
+                finished.add(current)
+                current = None
+                if len(finished) == len(sections): break
+                continue
+            sections[current].append(line)
+        
+        # 移除各章节末尾的空行
+        for section_lines in sections.values():
+            while section_lines and not section_lines[-1].strip():
+                section_lines.pop()
+        
+        return sections
     
     def _cleanup_old_summary_files(self, keep_count: int = 1) -> None:
         """清理旧的整合文件，只保留最新的1个"""
@@ -405,20 +689,28 @@ class FiveDaysSummaryManager:
 class FeishuNotifier:
     """负责向飞书自动化发送通知"""
     def __init__(self, webhook_url: str): self.webhook_url = webhook_url
-    def send_notification(self, new_telegrams: list[dict]) -> None:
+    def send_notification(self, new_telegrams: list[Telegram]) -> None:
         if not self.webhook_url: return
         if not new_telegrams:
             print(f"[{TimeHelper.format_datetime()}] 没有新的电报内容可供飞书推送。")
             return
         
         # 按时间升序发送通知，方便阅读
-        new_telegrams.sort(key=lambda x: x.get("timestamp_raw", 0))
-        content = "\n\n".join([f"[{t.get('time')}] {t.get('content')} - {t.get('url')}" for t in new_telegrams])
+        new_telegrams.sort(key=_BY_TIMESTAMP)
+        content = "\n\n".join(f"[{t.time}] {t.content} - {t.url}" for t in new_telegrams)
         payload = {"content": {"text": content, "total_titles": len(new_telegrams), "timestamp": TimeHelper.format_datetime(), "report_type": "财联社电报"}}
         
+        body = _json_dumps(payload)
+        headers = {"Content-Type": "application/json"}
+        # 可选：中文文本压缩率高，开启阈值后较大的请求体用快速档 gzip 压缩以减少传输字节
+        gzip_threshold = CONFIG["WEBHOOK_GZIP_THRESHOLD"]
+        if gzip_threshold and len(body) > gzip_threshold:
+            body = gzip.compress(body, compresslevel=1)
+            headers["Content-Encoding"] = "gzip"
+        
         print(f"[{TimeHelper.format_datetime()}] 正在发送 {len(new_telegrams)} 条新电报到飞书自动化。")
         try:
-            response = requests.post(self.webhook_url, json=payload, timeout=CONFIG["REQUEST_TIMEOUT"])
+            response = _SESSION.post(self.webhook_url, data=body, headers=headers, timeout=CONFIG["REQUEST_TIMEOUT"])
             if response.status_code != 200:
                 print(f"[{TimeHelper.format_datetime()}] 发送飞书通知失败，状态码：{response.status_code}，响应：{response.text}")
         except requests.exceptions.RequestException as e:
@@ -459,7 +751,7 @@ class FeishuBotManager:
         
         try:
             print(f"[{TimeHelper.format_datetime()}] 正在获取飞书访问令牌...")
-            response = requests.post(self.token_url, json=payload, timeout=CONFIG["REQUEST_TIMEOUT"])
+            response = _SESSION.post(self.token_url, json=payload, timeout=CONFIG["REQUEST_TIMEOUT"])
             response.raise_for_status()
             
             data = response.json()
@@ -510,7 +802,7 @@ class FeishuBotManager:
                     'file_name': (None, file_path.name)
                 }
                 
-                response = requests.post(self.upload_url, headers=headers, files=files, timeout=CONFIG["REQUEST_TIMEOUT"])
+                response = _SESSION.post(self.upload_url, headers=headers, files=files, timeout=CONFIG["REQUEST_TIMEOUT"])
                 response.raise_for_status()
                 
                 data = response.json()
@@ -554,7 +846,7 @@ class FeishuBotManager:
         try:
             print(f"[{TimeHelper.format_datetime()}] 正在发送文件消息到飞书群聊: {file_name}")
             
-            response = requests.post(
+            response = _SESSION.post(
                 f"{self.message_url}?receive_id_type=chat_id",
                 headers=headers,
                 json=payload,
@@ -613,7 +905,7 @@ class FeishuBotManager:
         }
         
         try:
-            response = requests.post(
+            response = _SESSION.post(
                 f"{self.message_url}?receive_id_type=chat_id",
                 headers=headers,
                 json=payload,
@@ -646,7 +938,7 @@ class FeishuBotManager:
                 "app_secret": self.app_secret
             }
             
-            response = requests.post(self.app_token_url, json=payload, timeout=CONFIG["REQUEST_TIMEOUT"])
+            response = _SESSION.post(self.app_token_url, json=payload, timeout=CONFIG["REQUEST_TIMEOUT"])
             response.raise_for_status()
             
             data = response.json()
@@ -687,7 +979,9 @@ class FeishuBotManager:
 # --- 8. 主程序逻辑 ---
 def main():
     """主函数，编排整个爬取、保存和通知流程"""
-    print(f"\n--- 财联社电报抓取与通知程序启动 --- [{TimeHelper.format_datetime()}]")
+    # 本次运行的基准时间只取一次，日期判断与定时任务判断都基于它
+    run_time = TimeHelper.get_beijing_time()
+    print(f"\n--- 财联社电报抓取与通知程序启动 --- [{TimeHelper.format_datetime(run_time)}]")
 
     file_manager = TelegramFileManager(CONFIG["OUTPUT_DIR"])
     feishu_notifier = FeishuNotifier(CONFIG["FEISHU_WEBHOOK_URL"])
@@ -706,27 +1000,33 @@ def main():
         print(f"[{TimeHelper.format_datetime()}] 飞书Bot功能已启用，但配置不完整，将跳过飞书推送")
 
     # 1. 获取财联社电报
-    fetched_telegrams = CailianpressAPI.fetch_telegrams()
-    if not fetched_telegrams:
+    fetched_telegrams, fetch_state = CailianpressAPI.fetch_telegrams()
+    if fetched_telegrams is None:
         print(f"[{TimeHelper.format_datetime()}] 未获取到任何财联社电报，程序退出。")
         return
 
     # 2. 识别真正的新电报 (用于文件追加和飞书通知)
-    today_date_str = TimeHelper.get_beijing_time().strftime("%Y-%m-%d")
-    existing_ids = file_manager.get_existing_ids_for_date(today_date_str)
+    today_date_str = run_time.strftime("%Y-%m-%d")
+    existing_ids = frozenset(file_manager.get_existing_ids_for_date(today_date_str))
     
-    new_telegrams = [t for t in fetched_telegrams if t.get("id") and t["id"] not in existing_ids and t.get("timestamp_raw")]
+    new_telegrams = [t for t in fetched_telegrams if t.id and t.id not in existing_ids and t.timestamp_raw]
 
     if not new_telegrams:
         print(f"[{TimeHelper.format_datetime()}] 本次运行没有发现需要记录的新电报。")
     else:
         print(f"[{TimeHelper.format_datetime()}] 发现 {len(new_telegrams)} 条新电报需要处理。")
 
-    # 3. 将新电报追加到文件
-    has_new_content = file_manager.append_new_telegrams(new_telegrams)
-
-    # 4. 发送飞书通知
-    feishu_notifier.send_notification(new_telegrams)
+    # 3 & 4. 追加文件与发送飞书通知互不依赖，并发执行以重叠磁盘 I/O 与网络等待
+    # 两者都会对列表原地排序，因此通知线程使用独立副本
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        notify_future = executor.submit(feishu_notifier.send_notification, list(new_telegrams))
+        has_new_content, all_saved = file_manager.append_new_telegrams(new_telegrams)
+        notify_future.result()
+    # 只有所有日期文件都写入成功才记录抓取状态，否则下次运行需要重新处理同一批电报
+    if all_saved:
+        CailianpressAPI.save_fetch_state(fetch_state)
+    else:
+        print(f"[{TimeHelper.format_datetime()}] 部分电报文件写入失败，本次不更新抓取状态，下次运行将重试。")
 
     # 5. 生成最近5天的整合文件
     summary_manager.generate_five_days_summary()
@@ -739,7 +1039,7 @@ def main():
         print(f"[{TimeHelper.format_datetime()}] 开始飞书Bot相关任务...")
         
         # 检查是否需要发送新的access_token（每90分钟发送一次）
-        current_time = TimeHelper.get_beijing_time()
+        current_time = run_time
         should_send_token = False
         
         # 检查是否是GitHub Actions环境
@@ -799,7 +1099,7 @@ def main():
                 summary_text = f"📰 财联社电报更新通知\n\n" \
                               f"🕐 更新时间: {TimeHelper.format_datetime()}\n" \
                               f"📊 新增电报: {len(new_telegrams)} 条\n" \
-                              f"🔴 重要电报: {len([t for t in new_telegrams if t.get('is_red')])} 条\n" \
+                              f"🔴 重要电报: {sum(1 for t in new_telegrams if t.is_red)} 条\n" \
                               f"📁 更多文件已上传，请查看群聊附件获取完整内容"
                 
                 feishu_bot.send_text_message(summary_text)
@@ -816,8 +1116,6 @@ def generate_five_days_summary_only():
     print(f"--- 财联社电报5天整合程序完成 --- [{TimeHelper.format_datetime()}]\n")
 
 if __name__ == "__main__":
-    import sys
-    
     # 检查命令行参数
     if len(sys.argv) > 1 and sys.argv[1] == "--summary":
         generate_five_days_summary_only()
@@ -90,11 +90,14 @@ print("[OK] chart_01_daily_count.png 已保存")
 # ========== 图2: 行业板块分布 (基于涨停原因) ==========
 fig, ax = plt.subplots(figsize=(11, 7), dpi=150)
 
+# 涨停原因的分隔符（中英文逗号、加号），预编译后供逐行 apply 复用
+TAG_SPLIT_RE = re.compile(r'[,+，+]')
+
 def extract_primary_tag(reason):
     if pd.isna(reason):
         return '其他'
     reason = str(reason)
-    tags = re.split(r'[,+，+]', reason)
+    tags = TAG_SPLIT_RE.split(reason)
     tags = [t.strip() for t in tags if t.strip()]
     return tags[0] if tags else '其他'
 
@@ -231,15 +234,12 @@ import seaborn as sns
 top_concepts = df_zt['主要概念'].value_counts().head(15).index.tolist()
 dates_wp = sorted(df_zt['日期'].unique())
 
-heatmap_data = []
-for concept in top_concepts:
-    row = []
-    for d in dates_wp:
-        count = len(df_zt[(df_zt['日期'] == d) & (df_zt['主要概念'] == concept)])
-        row.append(count)
-    heatmap_data.append(row)
-
-heatmap_df = pd.DataFrame(heatmap_data, index=top_concepts, columns=dates_wp)
+# 一次分组计数得到 (概念, 日期) 矩阵，代替逐格布尔筛选；缺失组合补 0
+heatmap_df = (df_zt[df_zt['主要概念'].isin(top_concepts)]
+              .groupby(['主要概念', '日期']).size()
+              .unstack(fill_value=0)
+              .reindex(index=top_concepts, columns=dates_wp, fill_value=0)
+              .rename_axis(index=None, columns=None))
 
 fig, ax = plt.subplots(figsize=(12, 10), dpi=150)
 sns.heatmap(heatmap_df, annot=True, fmt='d', cmap='YlOrRd', ax=ax,
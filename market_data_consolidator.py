@@ -7,6 +7,11 @@ from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from collections import defaultdict, Counter
 
+# 北京时间为固定偏移，模块加载时构造一次
+BEIJING_TZ = timezone(timedelta(hours=8))
+# 连板天数描述（如 "3天3板"）中提取天数的正则，预编译后在逐条解析中复用
+HIGH_DAYS_RE = re.compile(r'(\d+)天')
+
 class MarketDataConsolidator:
     def __init__(self, base_dir="."):
         root_path = Path(base_dir)
@@ -37,8 +42,7 @@ class MarketDataConsolidator:
             return ""
         try:
             # 💡 强行锁定北京时间
-            tz_beijing = timezone(timedelta(hours=8))
-            dt = datetime.fromtimestamp(int(float(ts)), tz=tz_beijing)
+            dt = datetime.fromtimestamp(int(float(ts)), tz=BEIJING_TZ)
             return dt.strftime("%H:%M:%S")
         except:
             return ""
@@ -48,8 +52,7 @@ class MarketDataConsolidator:
         try:
             # 1. 确定业务日期
             if not business_date:
-                tz_beijing = timezone(timedelta(hours=8))
-                business_date = datetime.now(tz=tz_beijing).strftime("%Y-%m-%d")
+                business_date = datetime.now(tz=BEIJING_TZ).strftime("%Y-%m-%d")
             else:
                 if len(business_date) == 8:
                     business_date = f"{business_date[:4]}-{business_date[4:6]}-{business_date[6:]}"
@@ -73,7 +76,6 @@ class MarketDataConsolidator:
             }
             
             final_rows = []
-            sector_mapping = defaultdict(list)
             
             # 💡 增强逻辑：从“最强风口” JSON 中提取行业映射
             code_to_industry = {}
@@ -103,7 +105,7 @@ class MarketDataConsolidator:
                             high_days_num = 1
                         elif "天" in raw_high_days:
                             try:
-                                high_days_num = int(re.search(r'(\d+)天', raw_high_days).group(1))
+                                high_days_num = int(HIGH_DAYS_RE.search(raw_high_days).group(1))
                             except:
                                 high_days_num = 1
                         else:
@@ -128,11 +130,6 @@ class MarketDataConsolidator:
                             "涨停原因": raw_reason if raw_reason else "未知"
                         }
                         final_rows.append(row)
-                        # 记录题材
-                        if pool_name == "涨停池":
-                            concepts = str(row["涨停原因"]).split('+')
-                            for c in concepts:
-                                if c.strip(): sector_mapping[c.strip()].append(row["股票名称"])
 
             if not final_rows:
                 print("⚠️ 未发现可处理的数据行，请检查 JSON 数据源。")
@@ -148,7 +145,7 @@ class MarketDataConsolidator:
             print(f"成功生成增强型表格: {output_file} (总计 {len(final_rows)} 条数据)")
             
             # 生成深度研报
-            self._generate_market_summary(business_date, sector_mapping, final_rows)
+            self._generate_market_summary(business_date, final_rows)
             
             # 合并5日数据
             self._generate_5day_consolidated_csv()
@@ -185,7 +182,7 @@ class MarketDataConsolidator:
         except Exception as e:
             print(f"归档过程出错: {e}")
 
-    def _generate_market_summary(self, business_date, sector_mapping, final_rows):
+    def _generate_market_summary(self, business_date, final_rows):
         overview_file = self.base_dir / f"{business_date}_市场大局观.json"
         
         # 💡 容错处理：即使没有大局观数据，也生成部分报告
@@ -208,16 +205,19 @@ class MarketDataConsolidator:
         zb_count = len([r for r in final_rows if "炸板" in r.get("池类型", "")])
         zb_rate_str = f"{(zb_count / (zt_count + zb_count) * 100):.1f}%" if (zt_count + zb_count) > 0 else "0%"
         
-        # 题材统计
-        def extract_concepts(rows):
-            concepts = []
-            for r in rows:
-                res = str(r.get("涨停原因", ""))
-                concepts.extend([c.strip() for c in res.split('+') if c.strip()])
-            return concepts
-
-        today_concepts = extract_concepts(non_st_zt_rows)
-        concept_counts = Counter(today_concepts)
+        # 题材统计、换手率解析与连板梯队在同一次遍历中完成
+        concept_counts = Counter()
+        reason_turnovers = []  # (涨停原因, 换手率)，无法解析换手率的行不参与平均
+        heights = defaultdict(list)
+        for r in non_st_zt_rows:
+            res = str(r.get("涨停原因", ""))
+            concept_counts.update(c.strip() for c in res.split('+') if c.strip())
+            try:
+                reason_turnovers.append((res, float(r.get("换手率%") or 0)))
+            except: pass
+            h = int(r.get("连板天数", 1))
+            if h > 1:
+                heights[h].append(f"{r['股票名称']}({res.split('+')[0]})")
         top_mainlines = concept_counts.most_common(5)
 
         # 昨日比对
@@ -274,24 +274,12 @@ class MarketDataConsolidator:
         ]
         
         for concept, count in top_mainlines:
-            avg_t = 0; s_c = 0
-            for r in non_st_zt_rows:
-                if concept in str(r.get("涨停原因", "")):
-                    try:
-                        avg_t += float(r.get("换手率%") or 0); s_c += 1
-                    except: pass
-            avg_t = avg_t / s_c if s_c > 0 else 0
+            matched = [t for reason, t in reason_turnovers if concept in reason]
+            avg_t = sum(matched) / len(matched) if matched else 0
             summary_content.append(f"- **{concept}** ({count} 股涨停) | 平均换手 `{avg_t:.1f}%`")
 
         summary_content.append(f"")
         summary_content.append(f"### 🪜 连板梯队 (身位逻辑 · 已剔除ST)")
-        heights = defaultdict(list)
-        for r in non_st_zt_rows:
-            h = int(r.get("连板天数", 1))
-            if h > 1:
-                reason = str(r.get("涨停原因", "")).split('+')[0]
-                heights[h].append(f"{r['股票名称']}({reason})")
-        
         for h in sorted(heights.keys(), reverse=True):
             summary_content.append(f"- **{h}板** : {'、'.join(heights[h])}")
         
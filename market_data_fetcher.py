@@ -6,6 +6,9 @@ import random
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
+# 北京时间为固定偏移，模块加载时构造一次
+BEIJING_TZ = timezone(timedelta(hours=8))
+
 class MarketDataFetcher:
     def __init__(self, base_dir="."):
         self.base_dir = Path(base_dir)
@@ -18,8 +21,12 @@ class MarketDataFetcher:
         
     def _get_business_date(self):
         # 💡 强制使用北京时间
-        tz_beijing = timezone(timedelta(hours=8))
-        return datetime.now(tz=tz_beijing).strftime("%Y%m%d")
+        return datetime.now(tz=BEIJING_TZ).strftime("%Y%m%d")
+
+    def _save_json(self, filename, data):
+        """先在内存中完成序列化，再一次性写入文件，避免 json.dump 逐片段多次写入"""
+        with open(self.output_dir / filename, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(data, ensure_ascii=False, indent=4))
 
     def fetch_pool_all_pages(self, base_url_pattern, filename, date_str):
         """循环抓取所有页面，确保数据完整"""
@@ -74,8 +81,7 @@ class MarketDataFetcher:
                     "business_date": date_str
                 }
             }
-            with open(self.output_dir / filename, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, ensure_ascii=False, indent=4)
+            self._save_json(filename, output_data)
             print(f"成功保存 {len(all_info)} 条数据到 {filename}")
             return True
         return False
@@ -89,8 +95,7 @@ class MarketDataFetcher:
                 res.raise_for_status()
                 data = res.json()
                 if data.get("status_code") == 0:
-                    with open(self.output_dir / filename, 'w', encoding='utf-8') as f:
-                        json.dump(data, f, ensure_ascii=False, indent=4)
+                    self._save_json(filename, data)
                     print(f"成功同步最强风口数据")
                     return True
             except Exception as e:
@@ -107,8 +112,7 @@ class MarketDataFetcher:
                 res.raise_for_status()
                 data = res.json()
                 if data.get("status_code") == 0:
-                    with open(self.output_dir / filename, 'w', encoding='utf-8') as f:
-                        json.dump(data, f, ensure_ascii=False, indent=4)
+                    self._save_json(filename, data)
                     print(f"成功同步市场大局观数据")
                     return True
             except Exception as e: